@@ -110,6 +110,13 @@ Command line interface
 
 
 For all different options and help use `--help` option.
+
+When only rendering videos (the `_video` commands), matplotlib's
+non-interactive Agg backend makes creating and drawing the figures faster.
+Select it with matplotlib's own `MPLBACKEND` environment variable, for example
+
+    MPLBACKEND=Agg python -m gonioanalysis.drosom.terminal ...
+
 In case no ROIs have been selected, the 
 When elections of the ROIs cannot be done in headless environments.
 '''
@@ -1,36 +1,45 @@
 '''
 Central settings for save/load directories.
+
+The saving directories (ANALYSES_SAVEDIR, PROCESSING_TEMPDIR, ...) are
+created when one of them is first accessed, including by
+`from gonioanalysis.directories import ANALYSES_SAVEDIR`. Importing the
+module itself, or only GONIODIR and CODE_ROOTDIR, does no filesystem work.
 '''
 
 import os
-import platform
+import sys
 
-CODE_ROOTDIR = os.path.dirname(os.path.realpath(__file__))
+if __spec__ is not None and __spec__.origin:
+    # Already an absolute path resolved by the import system
+    CODE_ROOTDIR = os.path.dirname(__spec__.origin)
+else:
+    CODE_ROOTDIR = os.path.dirname(os.path.realpath(__file__))
 USER_HOMEDIR = os.path.expanduser('~')
 
-if platform.system() == "Windows":
+if sys.platform == "win32":
     GONIODIR = os.path.join(USER_HOMEDIR, 'GonioAnalysis')
 else:
     GONIODIR = os.path.join(USER_HOMEDIR, '.Gonioanalysis')
+GONIODIR = sys.intern(GONIODIR)
 
 
-ANALYSES_SAVEDIR = os.path.join(GONIODIR, 'final_results')
-PROCESSING_TEMPDIR = os.path.join(GONIODIR, 'intermediate_data')
-PROCESSING_TEMPDIR_BIGFILES = os.path.join(GONIODIR, 'intermediate_bigfiles')
-
+# DIRECTORIES THAT HAVE TO BE CREATED, as (name, path) pairs
+# These are served as module attributes by __getattr__ so that
+# the existence check runs only when one of them is first used.
+# ALLDIRS gives the same as a dict.
+_DIRS = (('ANALYSES_SAVEDIR', sys.intern(os.path.join(GONIODIR, 'final_results'))),
+        ('PROCESSING_TEMPDIR', sys.intern(os.path.join(GONIODIR, 'intermediate_data'))),
+        ('PROCESSING_TEMPDIR_BIGFILES', sys.intern(os.path.join(GONIODIR, 'intermediate_bigfiles'))))
 
-# DIRECTORIES THAT HAVE TO BE CREATED
-ALLDIRS= {'ANALYSES_SAVEDIR': ANALYSES_SAVEDIR,
-        'PROCESSING_TEMPDIR': PROCESSING_TEMPDIR,
-        'PROCESSING_TEMPDIR_BIGFILES': PROCESSING_TEMPDIR_BIGFILES}
+# Set True once ensure_directories has succeeded
+_CHECKED = False
 
 
 def print_directories():
 
-    print('These are the directories')
-    
-    for key, item in ALLDIRS.items():
-        print('{} {}'.format(key, item))
+    lines = ['{} {}'.format(key, item) for key, item in _DIRS]
+    print('\n'.join(['These are the directories'] + lines))
 
 
 
@@ -62,7 +71,31 @@ def cli_ask_creation(needed_directories):
 
 
 
-def directories_check(ui=cli_ask_creation):
+def _missing_directories():
+    '''
+    Returns a list of the directories in _DIRS that do not exist.
+
+    Each parent directory is scanned only once (normally all the
+    directories share GONIODIR) instead of checking each directory
+    separately.
+    '''
+    children = {}
+
+    for key, item in _DIRS:
+        parent = os.path.dirname(item)
+
+        if parent not in children:
+            try:
+                with os.scandir(parent) as entries:
+                    children[parent] = {entry.name for entry in entries if entry.is_dir()}
+            except FileNotFoundError:
+                children[parent] = set()
+
+    return [item for key, item in _DIRS if os.path.basename(item) not in children[os.path.dirname(item)]]
+
+
+
+def ensure_directories(ui=cli_ask_creation):
     '''
     Perform a check that the saving directories exist.
     
@@ -71,32 +104,61 @@ def directories_check(ui=cli_ask_creation):
                 As the first argument it gets the list of to be created directories
 
                 If ui is not callable, raise an error.
+
+    The check is done only once per process; later calls return immediately.
     '''
-    non_existant = []
-    
-    for key, item in ALLDIRS.items():
+    global _CHECKED
+    if _CHECKED:
+        return
 
-        if not os.path.exists(item):
-            non_existant.append(item)
+    non_existant = _missing_directories()
 
     # If some directories are not created, launch an input requiring
     # user interaction.
     if non_existant:
         if callable(ui):
             if ui(non_existant) == True:
-                for directory in non_existant:
-                    os.makedirs(directory, exist_ok=True)
+                # Shallowest first so that nested ones find their parent
+                for directory in sorted(non_existant, key=lambda p: p.count(os.sep)):
+                    # Plain mkdir is one syscall; makedirs would first
+                    # stat the parent
+                    try:
+                        os.mkdir(directory)
+                    except FileExistsError:
+                        pass
+                    except FileNotFoundError:
+                        os.makedirs(directory, exist_ok=True)
             else:
                 raise NotImplementedError("Reselecting directories in UI not yet implemented")
         else:
             raise OSError("All directories not created and ui is not callable")
 
+    _CHECKED = True
+
+
+# Old name
+directories_check = ensure_directories
+
+
+def __getattr__(name):
+    '''
+    Lazily returns the saving directories, making sure they exist.
+    '''
+    if name == 'ALLDIRS':
+        return dict(_DIRS)
+
+    for key, item in _DIRS:
+        if key == name:
+            ensure_directories()
+            # Bind all as real attributes; later lookups skip __getattr__
+            globals().update(_DIRS)
+            return item
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
 
 
 if __name__ == "__main__":
     print_directories()
-else:
-    directories_check()
 
 
 
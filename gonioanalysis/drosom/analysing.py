@@ -261,11 +261,13 @@ class MAnalyser(VectorGettable, SettingAngleLimits, ShortNameable):
         self.vector_rotation = None
         self._movements_skelefn = 'movements_{}_{}{}.json' # specimen_name, eye, active_analysis
         
-        self.skiplist_savefn = os.path.join(PROCESSING_TEMPDIR, 'MAnalyser_data', folder, 'imagefolder_skiplist.json')
-        self.CROPS_SAVEFN = os.path.join(PROCESSING_TEMPDIR, 'MAnalyser_data', folder, 'rois_{}.json'.format(folder))
-        self.MOVEMENTS_SAVEFN = os.path.join(PROCESSING_TEMPDIR, 'MAnalyser_data', folder, self._movements_skelefn.format(folder, '{}', ''))
+        self.SAVEDIR = os.path.join(PROCESSING_TEMPDIR, 'MAnalyser_data', folder)
 
-        self.LINK_SAVEDIR = os.path.join(PROCESSING_TEMPDIR, 'MAnalyser_data', folder, 'linked_data')
+        self.skiplist_savefn = os.path.join(self.SAVEDIR, 'imagefolder_skiplist.json')
+        self.CROPS_SAVEFN = os.path.join(self.SAVEDIR, 'rois_{}.json'.format(folder))
+        self.MOVEMENTS_SAVEFN = os.path.join(self.SAVEDIR, self._movements_skelefn.format(folder, '{}', ''))
+
+        self.LINK_SAVEDIR = os.path.join(self.SAVEDIR, 'linked_data')
         
 
         self.active_analysis = ''
@@ -350,9 +352,12 @@ class MAnalyser(VectorGettable, SettingAngleLimits, ShortNameable):
             name = ''
 
         if name == '':
-            self.MOVEMENTS_SAVEFN = os.path.join(PROCESSING_TEMPDIR, 'MAnalyser_data', self.folder, self._movements_skelefn.format(self.folder, '{}', ''))
+            suffix = ''
         else:
-            self.MOVEMENTS_SAVEFN = os.path.join(PROCESSING_TEMPDIR, 'MAnalyser_data', self.folder, self._movements_skelefn.format(self.folder, '{}', '_'+name))
+            suffix = '_'+name
+
+        self.MOVEMENTS_SAVEFN = os.path.join(self.SAVEDIR,
+                self._movements_skelefn.format(self.folder, '{}', suffix))
     
         if self.is_measured():
             self.load_analysed_movements()
@@ -1523,8 +1528,9 @@ class MAverager(VectorGettable, ShortNameable, SettingAngleLimits):
                     interpolated[0].append(np.array(intp_point))
                     interpolated[1].append(avec)
             
-            self.interpolation[eye] = {}
-            self.interpolation[eye][cachename] = np.array(interpolated[0]), np.array(interpolated[1])
+            # Keep the other cached rotations/settings of this eye so that
+            # switching vector_rotation back and forth does not recalculate
+            self.interpolation.setdefault(eye, {})[cachename] = np.array(interpolated[0]), np.array(interpolated[1])
             
         else:
             pass
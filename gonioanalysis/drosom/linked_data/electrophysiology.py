@@ -42,7 +42,7 @@ def _load_ergs(ergs_labbook, ergs_rootdir):
 
     for line in csvfile[1:]:
         efn = line[1]
-        match = glob.glob(ergs_rootdir+'/**/'+efn)
+        match = glob.glob(os.path.join(ergs_rootdir, '**', efn))
         if len(match) != 1:
             print('{} not found'.format(efn))
         else:
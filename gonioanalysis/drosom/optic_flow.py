@@ -62,47 +62,45 @@ def field_error(points_A, vectors_A, points_B, vectors_B, direction=False, colin
     Returns the errors at points_A
     '''
     
-    N_vectors = len(vectors_A)
+    # Vector angles are computed in single precision (halves the memory
+    # traffic of the (N, k, 3) gather); the neighbour search and the
+    # weighted average stay in double precision.
+    vectors_A = np.ascontiguousarray(vectors_A, dtype=np.float32)
+    vectors_B = np.ascontiguousarray(vectors_B, dtype=np.float32)
 
-    errors = np.empty(N_vectors)
-
-    kdtree = KDTree(points_B)
+    kdtree = KDTree(np.ascontiguousarray(points_B, dtype=np.float64))
     
 
-    distances, indices = kdtree.query(points_A, k=10, n_jobs=-1)
+    distances, indices = kdtree.query(np.ascontiguousarray(points_A, dtype=np.float64),
+            k=10, workers=-1)
     weights = 1/(np.array(distances)**2)
     
     # Check for any inf
-    for i_weights in range(weights.shape[0]):
-        if any(np.isinf(weights[i_weights])):
-            weights[i_weights] = np.isinf(weights[i_weights]).astype('int')
-
-    #if any(np.isinf(weights):
-    compare_vectors = [[vectors_B[i] for i in indx] for indx in indices]
-
-    for i, (vecA, vecBs, vecB_weights) in enumerate(zip(vectors_A, compare_vectors, weights)):
-        
-        vec_errors = []
-        
-        for vecB in vecBs:
-
-            angle = np.arccos(np.inner(vecA, vecB)/(np.linalg.norm(vecA) * np.linalg.norm(vecB)))
-            error = angle / np.pi
-            if not 0<=error<=1:
-                # Error is nan if either of the vectors is zero because this leads to division
-                # by zero because np.linalg.norm(vec0) = 0
-                # -> set error to 1 if vecA != vecB or 0 otherwise
-                if np.array_equal(vecA, vecB):
-                    error = 0
-                else:
-                    error = 1
-            
-            if direction and vecB[2] > vecA[2]:
-                error = -error
+    inf_rows = np.isinf(weights).any(axis=1)
+    weights[inf_rows] = np.isinf(weights[inf_rows]).astype('int')
 
-            vec_errors.append(error)
+    # All the compared vectors at once, shape (N_vectors, k, 3)
+    compare_vectors = vectors_B[indices]
+    
+    inners = np.einsum('ij,ikj->ik', vectors_A, compare_vectors)
+    norms = np.linalg.norm(vectors_A, axis=1)[:, np.newaxis] * np.linalg.norm(compare_vectors, axis=2)
+    
+    # Clip rounding errors of (anti)parallel vectors, nans stay nans
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vec_errors = np.arccos(np.clip(inners / norms, -1, 1)) / np.pi
+    
+    # Error is nan if either of the vectors is zero because this leads to division
+    # by zero because np.linalg.norm(vec0) = 0
+    # -> set error to 1 if vecA != vecB or 0 otherwise
+    invalid = ~((0 <= vec_errors) & (vec_errors <= 1))
+    if np.any(invalid):
+        equal = np.all(vectors_A[:, np.newaxis, :] == compare_vectors, axis=2)
+        vec_errors[invalid] = np.where(equal[invalid], 0, 1)
+    
+    if direction:
+        vec_errors = np.where(compare_vectors[:,:,2] > vectors_A[:, np.newaxis, 2], -vec_errors, vec_errors)
 
-        errors[i] = np.average(vec_errors, weights=vecB_weights)
+    errors = np.average(vec_errors, axis=1, weights=weights)
 
     if colinear:
         errors = 2 * np.abs(errors - 0.5)
@@ -4,15 +4,15 @@ Most commonly needed functions to plot the data.
 
 import os
 import math
-import copy
+import functools
 
 import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import proj3d
 import mpl_toolkits.axes_grid1
 import matplotlib.image
+from matplotlib.collections import LineCollection
 from scipy.ndimage import rotate
-import PIL
 
 from .common import (
         vector_plot,
@@ -28,13 +28,61 @@ from gonioanalysis.coordinates import rotate_vectors
 plt.rcParams.update({'font.size': 12})
 
 EYE_COLORS = {'right': 'blue', 'left': 'red'}
-REPEAT_COLORS = ['green', 'orange', 'pink']
+REPEAT_COLORS = ('green', 'orange', 'pink')
 
 
 DEFAULT_ELEV = 10
 DEFAULT_AZIM = 70
 DEFAULT_FIGSIZE = (16,9)
 
+# Rhabdomere R1-R7 (x,y) locations in images/dpp.tif
+DPP_RHABDOMERE_LOCATIONS = np.array([(74,60),(68,79),(58,101),(80,94),(96,87),(100,66),(85,74)])
+
+# Azimuthal (phi) ranges of the left and right eye surfaces in plot_3d_differencemap.
+# The right eye ranges are consecutive over 2 pi so they make one surface.
+DIFFERENCEMAP_PHI_LEFT = (np.linspace(math.pi/2, 3*math.pi/2, 50),)
+DIFFERENCEMAP_PHI_RIGHT = (np.linspace(3*math.pi/2, 2*math.pi, 25), np.linspace(0, math.pi/2, 25))
+
+
+@functools.lru_cache(maxsize=None)
+def _imread(fn):
+    '''
+    Reads and decodes an image from the images folder only once.
+    The returned array is read-only.
+    '''
+    image = matplotlib.image.imread(os.path.join(CODE_ROOTDIR, 'images', fn))
+    image.flags.writeable = False
+    return image
+
+
+@functools.lru_cache(maxsize=8)
+def _load_upscaled(fn, upscale):
+    '''
+    Returns an image from the images folder upscaled by an integer
+    factor (nearest neighbour). Cached because the animations
+    request the same image on every frame; the returned array is read-only.
+    '''
+    image = _imread(fn)
+    if upscale == 1:
+        return image
+    image = np.repeat(np.repeat(image, upscale, axis=0), upscale, axis=1)
+    image.flags.writeable = False
+    return image
+
+
+@functools.lru_cache(maxsize=2)
+def _load_rotated(fn, angle):
+    '''
+    Returns an image from the images folder rotated by angle (degrees)
+    using scipy.ndimage.rotate. Only a couple of images are cached, enough
+    to keep the constant angle extra illustration alongside the per-frame
+    rotation (each entry is a full RGBA float image of tens of MB).
+    '''
+    image = rotate(_load_upscaled(fn, 1), angle, mode='nearest', reshape=False)
+    image.flags.writeable = False
+    return image
+
+
 def plot_1d_magnitude(manalyser, image_folder=None, i_repeat=None,
         mean_repeats=False, mean_imagefolders=False, mean_eyes=False,
         color_eyes=False, gray_repeats=False, show_mean=False, show_std=False,
@@ -66,32 +114,19 @@ def plot_1d_magnitude(manalyser, image_folder=None, i_repeat=None,
         ax
             Matplotlib axes
         traces
-            What has been plotted
+            What has been plotted, an array of shape (N_traces, N_frames)
         N_repeats
             The total number of repeats (independent of i_repeat)
     '''
     
-    def get_x_yscaler(mag_rep_i):    
-        # FIXME Pixel size and fs should be read from the data
-        pixel_size = manalyser.get_pixel_size(image_folder)
-        fs = manalyser.get_imaging_frequency(image_folder)
-        N = len(mag_rep_i)
-
-        if milliseconds:
-            # In milliseconds
-            X = 1000* np.linspace(0, N/fs, N)
-        else:
-            X = np.arange(N)
-        
-        if microns:
-            yscaler = pixel_size
-        else:
-            yscaler = 1
-        
-        return X, yscaler
+    # FIXME Pixel size and fs should be read from the data
+    if microns:
+        yscaler = manalyser.get_pixel_size(image_folder)
+    else:
+        yscaler = 1
     
-    X = None
-    yscaler = None
+    if milliseconds:
+        fs = manalyser.get_imaging_frequency(image_folder)
 
     if ax is None:
         fig, ax = plt.subplots()
@@ -102,18 +137,42 @@ def plot_1d_magnitude(manalyser, image_folder=None, i_repeat=None,
         eyes = manalyser.eyes
 
     N_repeats = 0
-    traces = []
-   
+    
+    # First pass to count the traces to be plotted so that
+    # they can be stored in one preallocated array
+    all_magtraces = []
+    N_traces = 0
+    N = 0
 
     for eye in eyes:
         magtraces = manalyser.get_magnitude_traces(eye, image_folder=image_folder,
                 mean_repeats=mean_repeats, mean_imagefolders=mean_imagefolders)
+        all_magtraces.append((eye, magtraces))
+
+        for repeat_mags in magtraces.values():
+            for _i_repeat, mag_rep_i in enumerate(repeat_mags):
+                if i_repeat is None or _i_repeat == i_repeat:
+                    if N_traces and len(mag_rep_i) != N:
+                        raise ValueError('Magnitude traces of different lengths ({} and {} frames) cannot be plotted together'.format(N, len(mag_rep_i)))
+                    N_traces += 1
+                    N = len(mag_rep_i)
+    
+    if milliseconds:
+        # In milliseconds
+        X = 1000* np.linspace(0, N/fs, N)
+    else:
+        X = np.arange(N)
+
+    traces = np.empty((N_traces, N))
+    i_trace = 0
+
+    # When the traces share a colour (color_eyes, gray_repeats) they are
+    # drawn as one LineCollection per colour; {color: (label, segments)}
+    color_groups = {}
+
+    for eye, magtraces in all_magtraces:
         
         for angle, repeat_mags in magtraces.items():
-            
-            if X is None or yscaler is None:
-                X, yscaler = get_x_yscaler(repeat_mags[0])
-
 
             for _i_repeat, mag_rep_i in enumerate(repeat_mags):
                 
@@ -132,27 +191,43 @@ def plot_1d_magnitude(manalyser, image_folder=None, i_repeat=None,
                 else:
                     _label = ''
                 
-                Y = yscaler * mag_rep_i
+                Y = traces[i_trace]
+                np.multiply(yscaler, mag_rep_i, out=Y)
+                i_trace += 1
 
                 if color_eyes:
-                    ax.plot(X, Y, label=_label, color=EYE_COLORS.get(eye, 'green'))
+                    color = EYE_COLORS.get(eye, 'green')
+                    group_label = eyename if label else ''
                 elif gray_repeats:
-                    ax.plot(X, Y, label=_label, color='gray')
+                    color = 'gray'
+                    group_label = 'repeats' if label else ''
                 else:
                     ax.plot(X, Y, label=_label)
+                    continue
                 
-                traces.append(Y)
+                color_groups.setdefault(color, (group_label, []))[1].append(np.column_stack((X, Y)))
+    
+    for color, (group_label, segments) in color_groups.items():
+        ax.add_collection(LineCollection(segments, colors=color))
+        # Proxy artist for one legend entry per colour
+        ax.plot([], [], label=group_label, color=color)
+    
+    if color_groups:
+        ax.autoscale_view()
     
     meantrace = np.mean(traces, axis=0)
     if show_mean:
         ax.plot(X, meantrace, label='mean-of-all', color='black', lw=3)
 
     if show_std:
-        ax.plot(X, meantrace+np.std(traces, axis=0), '--', label='std-of-mean-of-all', color='black', lw=2)
-        ax.plot(X, meantrace-np.std(traces, axis=0), '--', color='black', lw=2)
+        # Same as np.std but reuses the mean computed above
+        std = np.sqrt(np.mean((traces-meantrace)**2, axis=0))
+        ax.plot(X, meantrace+std, '--', label='std-of-mean-of-all', color='black', lw=2)
+        ax.plot(X, meantrace-std, '--', color='black', lw=2)
     
     if label and show_label:
-        ax.legend(fontsize='xx-small', labelspacing=0.1, ncol=int(len(traces)/10)+1, loc='upper left')    
+        N_entries = len(ax.get_legend_handles_labels()[1])
+        ax.legend(fontsize='xx-small', labelspacing=0.1, ncol=int(N_entries/10)+1, loc='upper left')    
     
 
     if milliseconds:
@@ -180,12 +255,17 @@ def _set_analyser_attributes(analyser, skip_none=True, raise_errors=False, **kwa
 
     Returns a dictionary of the original parameters
     '''
-    for key, value in kwargs:
+    original = {}
+
+    for key, value in kwargs.items():
         if value is not None or skip_none == False:
             if hasattr(analyser, key):
+                original[key] = getattr(analyser, key)
                 setattr(analyser, key, value)
             elif raise_errors:
-                raise AttributeError('{} has no attribute {} prior setting'.format(anlayser, key))
+                raise AttributeError('{} has no attribute {} prior setting'.format(analyser, key))
+
+    return original
 
 
 def plot_3d_vectormap(manalyser, arrow_rotations = [0],
@@ -194,7 +274,7 @@ def plot_3d_vectormap(manalyser, arrow_rotations = [0],
         i_frame=0,
         pitch_rot=None, roll_rot=None, yaw_rot=None,
         animation=None, animation_type=None, animation_variable=None,
-        ax=None, **kwargs):
+        ax=None, _vectors_cache=None, **kwargs):
     '''
     Plot a 3D vectormap, where the arrows point the movement or feature directions.
     
@@ -209,6 +289,10 @@ def plot_3d_vectormap(manalyser, arrow_rotations = [0],
         If False, draw lines instead (only OAnalyser)
     rhabdomeres : bool
         If True, draw rhadbomeres (only OAnalyser)
+    _vectors_cache : dict or None
+        If given, the 3D vectors are stored here by (eye, rotation) and
+        reused when the same dict is passed again (other views of the
+        same data).
 
     **kwargs to vector_plot
     '''
@@ -228,8 +312,8 @@ def plot_3d_vectormap(manalyser, arrow_rotations = [0],
         if animation_type != 'rotate_arrows':
             i_frame = 0
         
-    _set_analyser_attributes({'pitch_rot': pitch_rot,
-        'roll_rot': roll_rot, 'yaw_rot': yaw_rot})
+    _set_analyser_attributes(manalyser, pitch_rot=pitch_rot,
+        roll_rot=roll_rot, yaw_rot=yaw_rot)
 
 
     if manalyser_type == 'OAnalyser':
@@ -239,7 +323,7 @@ def plot_3d_vectormap(manalyser, arrow_rotations = [0],
         # OAnalyser specific for Drosophila; Assuming that R3-R6 line is
         # analysed, let's also draw the line from R3 to R1.
         if arrow_rotations[0] == 0 and len(arrow_rotations) == 1:
-            arrow_rotations.append(29)
+            arrow_rotations = arrow_rotations + [29]
 
     if ax is None:
         fig = plt.figure(figsize=DEFAULT_FIGSIZE)
@@ -257,15 +341,30 @@ def plot_3d_vectormap(manalyser, arrow_rotations = [0],
     else:
         camerapos = False
     
+    # The same (eye, rotation) vectors are needed by the rhabdomeres
+    # and the arrows, so get them only once per call
+    if _vectors_cache is None:
+        vectors_cache = {}
+    else:
+        vectors_cache = _vectors_cache
+
+    def get_vectors(eye, rotation):
+        key = (eye, rotation)
+        if key not in vectors_cache:
+            # Set arrow/vector rotation
+            if manalyser.vector_rotation != rotation:
+                manalyser.vector_rotation = rotation
+            vectors_cache[key] = manalyser.get_3d_vectors(eye, correct_level=True,
+                    repeats_separately=repeats_separately,
+                    strict=True, vertical_hardborder=vertical_hardborder)
+        return vectors_cache[key]
+
     # For OAnalyser, when rhabdomeres is set True,
     # plot the rhabdomeres also
     if manalyser_type == 'OAnalyser' and rhabdomeres:
-        manalyser.vector_rotation = 0
         for eye in manalyser.eyes:
 
-            vectors_3d = manalyser.get_3d_vectors(eye, correct_level=True,
-                    repeats_separately=repeats_separately,
-                    strict=True, vertical_hardborder=vertical_hardborder)
+            vectors_3d = get_vectors(eye, 0)
 
             if eye == 'left':
                 mirror_lr = True
@@ -285,16 +384,10 @@ def plot_3d_vectormap(manalyser, arrow_rotations = [0],
         for eye in manalyser.eyes:
             if isinstance(colors, dict):
                 colr = colors[eye]
-            elif isinstance(colors, list):
+            elif isinstance(colors, (list, tuple)):
                 colr = colors[i_rotation]
             
-            # Set arrow/vector rotation
-            if rotation is not None or rotation != 0:
-                manalyser.vector_rotation = rotation
-            
-            vectors_3d = manalyser.get_3d_vectors(eye, correct_level=True,
-                    repeats_separately=repeats_separately,
-                    strict=True, vertical_hardborder=vertical_hardborder)
+            vectors_3d = get_vectors(eye, rotation)
             
             if manalyser_type == 'OAnalyser' and rhabdomeres:
                 
@@ -335,7 +428,8 @@ def plot_3d_differencemap(manalyser1, manalyser2, ax=None,
         elev=DEFAULT_ELEV, azim=DEFAULT_AZIM, colinear=True,
         colorbar=True, colorbar_text=True, colorbar_ax=None, reverse_errors=False,
         colorbar_text_positions=[[1.1,0.95,'left', 'top'],[1.1,0.5,'left', 'center'],[1.1,0.05,'left', 'bottom']],
-        i_frame=0, arrow_rotations=[0], pitch_rot=None, yaw_rot=None, roll_rot=None):
+        i_frame=0, arrow_rotations=[0], pitch_rot=None, yaw_rot=None, roll_rot=None,
+        _cached_result=None):
     '''
     Plots 3d heatmap presenting the diffrerence in the vector orientations
     for two analyser objects, by putting the get_3d_vectors of both analysers
@@ -359,6 +453,9 @@ def plot_3d_differencemap(manalyser1, manalyser2, ax=None,
         Arrow rotations, for the second manalyser
     i_frame : int
         Neglected here
+    _cached_result : dict or None
+        If given, the vectors and (non-reversed) errors are stored here
+        and reused when the same dict is passed again
     '''
     
     if ax is None:
@@ -380,37 +477,54 @@ def plot_3d_differencemap(manalyser1, manalyser2, ax=None,
         manalyser2.roll_rot = roll_rot
     
 
-    all_errors = []
-    for eye in manalyser1.eyes:
-        vectors = []
-        points = []
+    if _cached_result is None:
+        _cached_result = {}
+
+    eye_vectors = _cached_result.get('eye_vectors')
+    if eye_vectors is None:
+        eye_vectors = []
+        for eye in manalyser1.eyes:
+            vectors = []
+            points = []
 
-        for manalyser in [manalyser1, manalyser2]:
+            for manalyser in [manalyser1, manalyser2]:
             
-            vectors_3d = manalyser.get_3d_vectors(eye, correct_level=True,
-                repeats_separately=False,
-                strict=True, vertical_hardborder=True)
+                vectors_3d = manalyser.get_3d_vectors(eye, correct_level=True,
+                    repeats_separately=False,
+                    strict=True, vertical_hardborder=True)
  
-            points.append(vectors_3d[0])
-            vectors.append(vectors_3d[1])
-       
+                points.append(vectors_3d[0])
+                vectors.append(vectors_3d[1])
+        
+            eye_vectors.append((eye, points, vectors))
+        _cached_result['eye_vectors'] = eye_vectors
+
+    cached_errors = _cached_result.setdefault('errors', {})
+
+    # One error for each of manalyser1's points, written in place
+    all_errors = np.empty(sum(len(points[0]) for eye, points, vectors in eye_vectors))
+    offset = 0
+
+    for eye, points, vectors in eye_vectors:
         # Errors at the points[0]
-        errors = field_error(points[0], vectors[0], points[1], vectors[1], colinear=colinear)
+        errors = all_errors[offset:offset+len(points[0])]
+        if (eye, colinear) not in cached_errors:
+            cached_errors[(eye, colinear)] = field_error(points[0], vectors[0],
+                    points[1], vectors[1], colinear=colinear)
+        errors[:] = cached_errors[(eye, colinear)]
+        offset += len(errors)
         
         if reverse_errors:
-            errors = 1-errors
-
-        all_errors.append(errors)
+            np.subtract(1, errors, out=errors)
         
         if eye=='left':
-            all_phi_points = [np.linspace(math.pi/2, 3*math.pi/2, 50)]
+            all_phi_points = DIFFERENCEMAP_PHI_LEFT
         else:
-            all_phi_points = [np.linspace(0, math.pi/2, 25), np.linspace(3*math.pi/2, 2*math.pi,25)]
+            all_phi_points = DIFFERENCEMAP_PHI_RIGHT
 
-        for phi_points in all_phi_points:
-            m = surface_plot(ax, points[0], errors, phi_points=phi_points)
+        m = surface_plot(ax, points[0], errors, phi_points=all_phi_points)
     
-    errors = np.concatenate(all_errors)
+    errors = all_errors
 
     ax.view_init(elev=elev, azim=azim)
 
@@ -469,11 +583,48 @@ def plot_3d_differencemap(manalyser1, manalyser2, ax=None,
     return ax, errors
 
 
+def _record_compare_error(ax, rotation, error, reverse_error=np.nan):
+    '''
+    Appends one frame's mean error(s) at rotation to the total error
+    buffers stored on ax, growing them by doubling when full.
+
+    Keeps the indices of the minimum and maximum errors up to date
+    and exposes the recorded part as views in ax.pupil_compare_rotations,
+    ax.pupil_compare_errors and ax.pupil_compare_reverse_errors.
+    '''
+    n = getattr(ax, '_pupil_compare_n', None)
+    if n is None:
+        n = 0
+        ax._pupil_compare_buffer = np.empty((3, 1024), dtype=np.float64)
+        ax._pupil_compare_minmax = (0, 0)
+    
+    buffer = ax._pupil_compare_buffer
+    if n == buffer.shape[1]:
+        grown = np.empty((3, 2*n), dtype=np.float64)
+        grown[:, :n] = buffer
+        buffer = ax._pupil_compare_buffer = grown
+
+    buffer[:, n] = (np.nan if rotation is None else rotation, error, reverse_error)
+    
+    i_min, i_max = ax._pupil_compare_minmax
+    if error < buffer[1, i_min]:
+        i_min = n
+    if error > buffer[1, i_max]:
+        i_max = n
+    ax._pupil_compare_minmax = (i_min, i_max)
+    
+    n += 1
+    ax._pupil_compare_n = n
+    ax.pupil_compare_rotations = buffer[0, :n]
+    ax.pupil_compare_errors = buffer[1, :n]
+    ax.pupil_compare_reverse_errors = buffer[2, :n]
+
+
 def compare_3d_vectormaps(manalyser1, manalyser2, axes=None,
         illustrate=True, total_error=True, compact=False,
         animation=None, animation_type=None, animation_variable=None,
         optimal_ranges=None, pulsation_length=1, biphasic=False,
-        kwargs1={}, kwargs2={}, kwargsD={}, **kwargs):
+        kwargs1={}, kwargs2={}, kwargsD={}, _cached_result=None, **kwargs):
     '''
     Calls get 3d vectors for both analysers.
     Arrow rotation option only affects manalyser2
@@ -500,6 +651,9 @@ def compare_3d_vectormaps(manalyser1, manalyser2, axes=None,
         List of keyword arguments to pass to `plot_3d_vectormap`
     kwargsD : dict
         List of keywords arguments to pass to `plot_3d_differencemap`
+    _cached_result : dict or None
+        If given, the vectors and errors are stored here and reused
+        when the same data is plotted again from another view
     
     Returns [axes]
     '''
@@ -562,12 +716,17 @@ def compare_3d_vectormaps(manalyser1, manalyser2, axes=None,
     if manalyser2.__class__.__name__ == 'MAverage' and manalyser2.manalysers[0].__class__.__name__ == 'OAnalyser':
         kwargs2['arrows'] = False
     
+    if _cached_result is None:
+        _cached_result = {}
+
     iax = 0
-    plot_3d_vectormap(manalyser1, animation_type=animation_type, ax=axes[iax], **kwargs1)
+    plot_3d_vectormap(manalyser1, animation_type=animation_type, ax=axes[iax],
+            _vectors_cache=_cached_result.setdefault('vectors1', {}), **kwargs1)
     
     if not compact:
         iax += 1
-    plot_3d_vectormap(manalyser2, animation_type=animation_type, ax=axes[iax], **kwargs2)
+    plot_3d_vectormap(manalyser2, animation_type=animation_type, ax=axes[iax],
+            _vectors_cache=_cached_result.setdefault('vectors2', {}), **kwargs2)
     
 
     if biphasic:
@@ -576,12 +735,15 @@ def compare_3d_vectormaps(manalyser1, manalyser2, axes=None,
         kwargsDr = kwargsD.copy()
         kwargsDr['colorbar'] = False
         daxr, reverse_errors = plot_3d_differencemap(manalyser1, manalyser2,
-                ax=axes[iax], reverse_errors=True, **kwargsDr, **kwargs2)
+                ax=axes[iax], reverse_errors=True,
+                _cached_result=_cached_result.setdefault('difference', {}),
+                **kwargsDr, **kwargs2)
     
     
     iax += 1
     dax, errors = plot_3d_differencemap(manalyser1, manalyser2,
-            ax=axes[iax], **kwargsD, **kwargs2)
+            ax=axes[iax], _cached_result=_cached_result.setdefault('difference', {}),
+            **kwargsD, **kwargs2)
     
     if illustrate:
 
@@ -598,22 +760,18 @@ def compare_3d_vectormaps(manalyser1, manalyser2, axes=None,
         if animation_type == 'rotate_arrows':
             
             upscale = 4
-            image = matplotlib.image.imread(os.path.join(CODE_ROOTDIR, 'images', 'dpp.tif'))
-            image = PIL.Image.fromarray(image)
-            ow,oh = image.size
-            image = image.resize((int(ow*upscale), int(oh*upscale)), PIL.Image.NEAREST)
-            image = np.array(image)
+            image = _load_upscaled('dpp.tif', upscale)
 
-            # Vector p0,rp1 to point the current axis rotation
+            # Vector p0,rp1 to point the current axis rotation,
+            # orp1 to the optimal rotation and rp1_36 along the R3-R6 line.
+            # All three rotations of p1 done at once.
             R6R3line = 40
-            rot = -math.radians( R6R3line + animation_variable ) 
+            rots = -np.radians(R6R3line + np.array([animation_variable,
+                np.mean(optimal_ranges[0][0:2]), 0]))
             p0 = [int(image.shape[0]/2), int(image.shape[1]/2)]
             p1 = np.array([p0[0],0])/2
-            rp1 = np.array([p1[0]*math.cos(rot)-p1[1]*math.sin(rot), p1[0]*math.sin(rot)+p1[1]*math.cos(rot)])
-            
-            # Optimal
-            orot = -math.radians( R6R3line + np.mean(optimal_ranges[0][0:2]))
-            orp1 = np.array([p1[0]*math.cos(orot)-p1[1]*math.sin(orot), p1[0]*math.sin(orot)+p1[1]*math.cos(orot)])
+            cos, sin = np.cos(rots), np.sin(rots)
+            rp1, orp1, rp1_36 = np.stack([p1[0]*cos-p1[1]*sin, p1[0]*sin+p1[1]*cos], axis=1)
             
             # Make image pulsate
             sx, sy = (0,0)
@@ -634,36 +792,32 @@ def compare_3d_vectormaps(manalyser1, manalyser2, axes=None,
         
                 #image[r[1]+sy:r[1]+r[3]+sy, r[0]+sx:r[0]+r[2]+sx] = image[r[1]:r[1]+r[3], r[0]:r[0]+r[2]]
                 image = image[r[1]-sy:r[1]+r[3]-sy, r[0]-sx:r[0]+r[2]-sx]
+            
             ax.imshow(image, cmap='gray')
            
             # R3-R6 dotted white line
             if manalyser1.manalysers[0].__class__.__name__ == 'FAnalyser':
-                rot36 = -math.radians( R6R3line )
-                rp1_36 = np.array([p1[0]*math.cos(rot36)-p1[1]*math.sin(rot36), p1[0]*math.sin(rot36)+p1[1]*math.cos(rot36)])
                 ax.axline((p0[0]-r[0], p0[1]-r[1]), (p0[0]+rp1_36[0]-r[0], p0[1]+rp1_36[1]-r[1]), ls='--', color='white', lw=0.5)
 
             ax.axline((p0[0]-r[0], p0[1]-r[1]), (p0[0]+rp1[0]-r[0], p0[1]+rp1[1]-r[1]), color=REPEAT_COLORS[0])
             
             # Rhabdomere locations, dpp.tiff specific
-            rhabdomere_locs = [(x*upscale+sx-r[0],y*upscale+sy-r[1]) for x,y in [(74,60),(68,79),(58,101),(80,94),(96,87),(100,66),(85,74)]]
-            for i_rhabdomere, loc in enumerate(rhabdomere_locs):
-                ax.text(*loc, 'R'+str(i_rhabdomere+1), color=(0.2,0.2,0.2), ha='center', va='center', fontsize=10)
+            rhabdomere_locs = DPP_RHABDOMERE_LOCATIONS*upscale + np.array([sx-r[0], sy-r[1]])
+            for i_rhabdomere, (x, y) in enumerate(rhabdomere_locs):
+                ax.text(x, y, 'R'+str(i_rhabdomere+1), color=(0.2,0.2,0.2), ha='center', va='center', fontsize=10)
             
 
         elif animation_type == 'pitch_rot':
             
-            image = matplotlib.image.imread(os.path.join(CODE_ROOTDIR, 'images', 'from_mikko_annotated.png'))
-            ax.imshow(rotate(image, animation_variable, mode='nearest', reshape=False)) 
+            ax.imshow(_load_rotated('from_mikko_annotated.png', round(float(animation_variable), 2)))
             plot_2d_opticflow(ax, 'side')
 
         elif animation_type == 'yaw_rot':
-            image = matplotlib.image.imread(os.path.join(CODE_ROOTDIR, 'images', 'rotation_yaw.png'))
-            ax.imshow(rotate(image, animation_variable, mode='nearest', reshape=False))
+            ax.imshow(_load_rotated('rotation_yaw.png', round(float(animation_variable), 2)))
             plot_2d_opticflow(ax, 'side')
 
         elif animation_type == 'roll_rot':
-            image = matplotlib.image.imread(os.path.join(CODE_ROOTDIR, 'images', 'rotation_roll.png'))
-            ax.imshow(rotate(image, animation_variable, mode='nearest', reshape=False))
+            ax.imshow(_load_rotated('rotation_roll.png', round(float(animation_variable), 2)))
             plot_2d_opticflow(ax, 'outofplane')
 
 
@@ -683,9 +837,10 @@ def compare_3d_vectormaps(manalyser1, manalyser2, axes=None,
 
             if getattr(axes[0], 'extra_illustrate_ax', None) is None:
                 
-                tmp_ax = axes[0].figure.add_subplot(3,4,8)
-                tmp_ax.set_axis_off()
-                cbox = tmp_ax.get_position()
+                # Position of the 3x4 grid cell 8, without leaving an
+                # empty subplot there in the figure
+                fig = axes[0].figure
+                cbox = fig.add_gridspec(3, 4)[1, 3].get_position(fig)
                 w = abs(cbox.x1 - cbox.x0)
                 cbox.x0 += 0.25*w
                 cbox.x1 += 0.25*w
@@ -697,8 +852,8 @@ def compare_3d_vectormaps(manalyser1, manalyser2, axes=None,
                 axes[0].extra_illustrate_ax.set_axis_off()
                 axes[0].extra_illustrate_ax.set_frame_on(False)
 
-            image = matplotlib.image.imread(os.path.join(CODE_ROOTDIR, 'images', 'from_mikko_annotated.png'))
-            axes[0].extra_illustrate_ax.imshow(rotate(image, manalyser1.pitch_rot, mode='nearest', reshape=False))
+            image = _load_rotated('from_mikko_annotated.png', round(float(manalyser1.pitch_rot), 2))
+            axes[0].extra_illustrate_ax.imshow(image)
 
             rect = matplotlib.patches.Rectangle((0.9+0.05,0), 0.02, 1, transform=axes[0].extra_illustrate_ax.transAxes, fill=True,
                     color='yellow', linewidth=1)
@@ -716,21 +871,22 @@ def compare_3d_vectormaps(manalyser1, manalyser2, axes=None,
     
 
         ax = axes[iax]
-        if getattr(ax, 'pupil_compare_errors', None) is None:
-            ax.pupil_compare_errors = []
-            ax.pupil_compare_rotations = []
-
-        ax.pupil_compare_errors.append(np.mean(errors))
-        ax.pupil_compare_rotations.append( animation_variable )
+        if biphasic:
+            _record_compare_error(ax, animation_variable, np.mean(errors), np.mean(reverse_errors))
+        else:
+            _record_compare_error(ax, animation_variable, np.mean(errors))
+        
+        rotations = ax.pupil_compare_rotations
+        i_min, i_max = ax._pupil_compare_minmax
 
-        ax.plot( ax.pupil_compare_rotations, 1-np.array(ax.pupil_compare_errors), color='black',
+        ax.plot( rotations, 1-ax.pupil_compare_errors, color='black',
                 label='Fast phase')
-        ax.scatter( ax.pupil_compare_rotations[-1], 1-ax.pupil_compare_errors[-1], color='black' )
+        ax.scatter( rotations[-1], 1-ax.pupil_compare_errors[-1], color='black' )
        
 
         print('Minimum and maximum errors so far: {} (min, at angle {}), {} (max, at angle {})'.format(
-            np.min(ax.pupil_compare_errors), ax.pupil_compare_rotations[np.argmin(ax.pupil_compare_errors)],
-            np.max(ax.pupil_compare_errors), ax.pupil_compare_rotations[np.argmax(ax.pupil_compare_errors)]))
+            ax.pupil_compare_errors[i_min], rotations[i_min],
+            ax.pupil_compare_errors[i_max], rotations[i_max]))
 
         ax.spines['right'].set_visible(False)
         ax.spines['top'].set_visible(False)
@@ -767,14 +923,9 @@ def compare_3d_vectormaps(manalyser1, manalyser2, axes=None,
             ax.set_xticklabels(['-45$^\circ$', '0$^\circ$','45$^\circ$'])   
         
         if biphasic:
-            if getattr(ax, 'pupil_compare_reverse_errors', None) is None:
-                ax.pupil_compare_reverse_errors = []
-
-            ax.pupil_compare_reverse_errors.append(np.mean(reverse_errors))
-
-            ax.plot( ax.pupil_compare_rotations, 1-np.array(ax.pupil_compare_reverse_errors), color='gray',
+            ax.plot( rotations, 1-ax.pupil_compare_reverse_errors, color='gray',
                     label='Slower phase')
-            ax.scatter( ax.pupil_compare_rotations[-1], 1-ax.pupil_compare_reverse_errors[-1], color='gray' )
+            ax.scatter( rotations[-1], 1-ax.pupil_compare_reverse_errors[-1], color='gray' )
     
             ax.legend(loc=(0.39,1.2))
 
@@ -792,6 +943,116 @@ def compare_3d_vectormaps_compact(*args, **kwargs):
 
 
 
+def _analyser_kind(manalyser):
+    '''
+    Returns 'flow' for optic flow analysers, 'receptive_fields' for
+    biphasic receptive field MAnalysers and None for other analysers.
+    '''
+    first = manalyser.manalysers[0]
+    if first.__class__.__name__ == 'FAnalyser' or manalyser.__class__.__name__ == 'FAnalyser':
+        return 'flow'
+    elif first.__class__.__name__ == 'MAnalyser' and first.receptive_fields == True:
+        return 'receptive_fields'
+    return None
+
+
+def _illustrate_box(x0, y0, x1, y1, enlarge=False):
+    '''
+    Returns the extents (x0, y0, x1, y1) of the manyviews illustration
+    axes from the extents of its grid cell; widened to the left and
+    right and raised on top, and if enlarge, grown on every side.
+    '''
+    w = x1 - x0
+    h = y1 - y0
+    x0 -= w/8
+    x1 += w/3.3 + w/8
+    y1 += h/3.3
+    
+    if enlarge:
+        w = x1 - x0
+        x0 -= w/5
+        x1 += w/5
+        y0 -= w/5
+        y1 += w/5
+
+    return x0, y0, x1, y1
+
+
+def _manyviews_axes(rows, cols, biphasic, animation_type=None,
+        illustrate=True, total_error=True):
+    '''
+    Creates the figure and axes layout for compare_3d_vectormaps_manyviews.
+
+    Only called when no axes are given; animations pass the returned
+    axes back in for the later frames, so the layout is made once.
+
+    illustrate, total_error : bool
+        Whether to create the illustration and the total error axes
+    '''
+    fig = plt.figure(figsize=DEFAULT_FIGSIZE,dpi=300)
+    gs = fig.add_gridspec(rows, cols)
+    axes = []
+
+    # The aux axes offsets are tuned against the default subplot
+    # parameters, so read their grid cells before the adjustment below
+    illustrate_cell = gs[0, cols-1].get_position(fig)
+    colorbar_cell = gs[1, cols-1].get_position(fig)
+    error_cell = gs[2, cols-1].get_position(fig)
+
+    if biphasic:
+        fig.subplots_adjust(left=0.05, bottom=0.04, right=0.9, top=0.94, wspace=0.05, hspace=0.05)
+    else:
+        fig.subplots_adjust(left=0.1, bottom=0.04, right=0.9, top=0.95, wspace=0.05, hspace=0.05)
+
+    for i_view in range(rows):
+        for column in range(cols-1):
+            axes.append(fig.add_subplot(gs[i_view, column], projection='3d'))
+    
+    if illustrate:
+        x0, y0, x1, y1 = _illustrate_box(*illustrate_cell.extents,
+                enlarge=animation_type == 'pitch_rot')
+        axes[0].illustrate_ax = fig.add_axes([x0, y0, x1-x0, y1-y0])
+    else:
+        axes[0].illustrate_ax = None
+
+    if total_error:
+        # Slightly shifted from the bottom right grid cell
+        ax_pos = [error_cell.x0+0.02, error_cell.y0-0.04, error_cell.width+0.022, error_cell.height+0.02]
+        axes[0].error_ax = fig.add_axes(ax_pos)
+    else:
+        axes[0].error_ax = None
+
+    # Colorbar on the left side of the middle right grid cell
+    x0, y0, x1, y1 = colorbar_cell.extents
+    x1 -= (x1 - x0)/1.1
+    w = x1 - x0
+    axes[0].colorbar_ax = fig.add_axes([x0-2*w, y0, w, y1-y0])
+
+    return axes
+
+
+def _setup_aux_axes(illustrate_ax, error_ax, illustrate_title):
+    '''
+    Clears the manyviews illustration and total error axes (not cleared
+    by the animation, as they are attributes of the first axes) and
+    returns the ones in use as a list, illustration first.
+    '''
+    aux_axes = []
+
+    if illustrate_ax is not None:
+        illustrate_ax.clear()
+        illustrate_ax.set_title(illustrate_title, color=REPEAT_COLORS[0])
+        illustrate_ax.set_frame_on(False)
+        illustrate_ax.set_axis_off()
+        aux_axes.append(illustrate_ax)
+
+    if error_ax is not None:
+        error_ax.clear()
+        aux_axes.append(error_ax)
+
+    return aux_axes
+
+
 def compare_3d_vectormaps_manyviews(*args, axes=None,
         column_titles=['Microsaccades', 'Rhabdomere orientation', 'Difference', 'Mean microsaccade'],
         row_titles=['Dorsal\nview', 'Anterior\nview', 'Ventral\nview'],
@@ -799,10 +1060,17 @@ def compare_3d_vectormaps_manyviews(*args, axes=None,
     '''
     Just with different views rendered
     
-    First axes gets attributes .orientation_ax and .error_ax
+    First axes gets attributes .illustrate_ax, .error_ax and .colorbar_ax
+
+    illustrate_ax, total_error : bool
+        Set False to leave out the illustration or the total error axes
+        when the axes are created here
     '''
     
 
+    # Modified below; copy so that the default list stays the same
+    column_titles = list(column_titles)
+
     views = [[50,90], [0,90], [-50,90]]
     rows = len(views)
     cols = 4
@@ -818,123 +1086,97 @@ def compare_3d_vectormaps_manyviews(*args, axes=None,
             column_titles[3] = 'Difference\n with fast phase'
             column_titles[-1] = ''
 
-        plt.subplots_adjust(left=0.05, bottom=0.04, right=0.9, top=0.94, wspace=0.05, hspace=0.05)
-    else:
-        plt.subplots_adjust(left=0.1, bottom=0.04, right=0.9, top=0.95, wspace=0.05, hspace=0.05)
+    # These are options of this function, not of compare_3d_vectormaps
+    illustrate = kwargs.pop('illustrate_ax', True) in [True, None]
+    total_error = kwargs.pop('total_error', True) in [True, None]
 
     if axes is None:
-        fig = plt.figure(figsize=DEFAULT_FIGSIZE,dpi=300)
-        axes = []
-        
-
-        for i_view in range(rows):
-            for column in range(cols-1):
-                axes.append(fig.add_subplot(rows,cols,column+1+i_view*cols, projection='3d'))
-        
-        if getattr(kwargs, 'illustrate_ax', None) in [True, None]:
-            # FIXME Very hacky way to move the subplot right. For some reason
-            # when moved this way the plot also gets smaller?
-            axes[0].illustrate_ax = fig.add_subplot(rows,cols,cols)
-            cbox = axes[0].illustrate_ax.get_position()
-            w = abs(cbox.x1 - cbox.x0)
-            h = abs(cbox.y1 - cbox.y0)
-            cbox.x0 -= w/8
-            cbox.x1 += w / 3.3 +w/8
-            cbox.y1 += h / 3.3
-            
-            if kwargs.get('animation_type', None) == 'pitch_rot':
-                w = abs(cbox.x1 - cbox.x0)
-                h = abs(cbox.y1 - cbox.y0)
-                cbox.x0 -= w/5
-                cbox.x1 += w/5
-                cbox.y0 -= w/5
-                cbox.y1 += w/5
-
-            axes[0].illustrate_ax.set_position(cbox)
-            axes[0].illustrate_ax.cbox = cbox
-
-        if getattr(kwargs, 'total_error', None) in [True, None]:
-            ax = fig.add_subplot(rows,cols,3*cols)
-            ax_pos = ax.get_position()
-            ax_pos = [ax_pos.x0+0.02, ax_pos.y0-0.04, ax_pos.width+0.022, ax_pos.height+0.02]
-            ax.remove()
-            ax = fig.add_axes(ax_pos)
-            axes[0].error_ax = ax
-
-        tmp_ax = fig.add_subplot(rows, cols, 2*cols)
-        tmp_ax.set_axis_off()
-        cbox = tmp_ax.get_position()
-        
-        cbox.x1 -= abs(cbox.x1 - cbox.x0)/1.1
-        w = abs(cbox.x1 - cbox.x0)
-        cbox.x0 -= 2*w
-        cbox.x1 -= 2*w
-        axes[0].colorbar_ax = ax.figure.add_axes(cbox)
-    
-    # Clear axes that are attributes of the axes[0]; These won't
-    # otherwise get cleared for the animation/video
-    
-    if getattr(axes[0], 'error_ax', None) is not None:
-        axes[0].error_ax.clear()
+        axes = _manyviews_axes(rows, cols, biphasic, kwargs.get('animation_type', None),
+                illustrate=illustrate, total_error=total_error)
     
+    # Given axes may carry aux axes that are now toggled off; remove
+    # them from the figure instead of leaving their old contents there
+    for name, enabled in [('illustrate_ax', illustrate), ('error_ax', total_error)]:
+        aux_ax = getattr(axes[0], name, None)
+        if aux_ax is not None and not enabled:
+            aux_ax.figure.delaxes(aux_ax)
+            setattr(axes[0], name, None)
+
+    illustrate_ax = getattr(axes[0], 'illustrate_ax', None)
+    error_ax = getattr(axes[0], 'error_ax', None)
+    colorbar_ax = getattr(axes[0], 'colorbar_ax', None)
+
     # Set custom column titles
-    for i_manalyser in range(2):
-        manalyser = args[i_manalyser]
-        if manalyser.manalysers[0].__class__.__name__ == 'FAnalyser' or manalyser.__class__.__name__ == 'FAnalyser':
-            if '\n' in ''.join(column_titles):
+    kinds = [_analyser_kind(manalyser) for manalyser in args[0:2]]
+    has_newline = any('\n' in title for title in column_titles)
+
+    for i_manalyser, kind in enumerate(kinds):
+        if kind == 'flow':
+            if has_newline:
                 column_titles[i_manalyser] = 'Optic flow\n'
             else:
                 column_titles[i_manalyser] = 'Optic flow'
-
-        if manalyser.manalysers[0].__class__.__name__ == 'MAnalyser' and manalyser.manalysers[0].receptive_fields == True:
+        elif kind == 'receptive_fields':
             column_titles[i_manalyser] = 'Biphasic receptive field\nmovement directions'
+            has_newline = True
 
 
-    if args[0].manalysers[0].__class__.__name__ == 'FAnalyser':
+    # Biphasic layouts leave the illustration untitled (its enlarged
+    # axes reaches the top edge of the figure)
+    if kinds[0] == 'flow' and not biphasic:
         column_titles[cols-1] = 'Mean optic flow axis'
 
-    if getattr(axes[0], 'illustrate_ax', None) is not None:
-        axes[0].illustrate_ax.clear()
-        axes[0].illustrate_ax.set_title(column_titles[-1], color=REPEAT_COLORS[0])
-        #axes[0].illustrate_ax.text(0.5,1, column_titles[-1], transform=axes[0].illustrate_ax.transAxes, ha='center', va='bottom')        
-        axes[0].illustrate_ax.set_frame_on(False)
-        axes[0].illustrate_ax.set_axis_off()
-
     # Add column titles
     for title, ax in zip(column_titles[:-1], axes[0:cols-1]):
         ax.set_title(title)
     
-    # Add row titles for the views
-    for title, ax in zip(row_titles, axes[::cols-1]):
+    # Add row titles for the views. These are figure texts that clearing
+    # the axes does not remove, so create them once and update the text
+    fig = axes[0].figure
+    row_texts = getattr(fig, 'manyviews_row_titles', None)
+    if row_texts is None:
+        row_texts = fig.manyviews_row_titles = []
+        for ax in axes[::cols-1]:
+            pos = ax.get_position()
+            if biphasic:
+                row_texts.append(fig.text(pos.x0-0.1*pos.width, pos.y0+0.5*pos.height, '',
+                    va='center', ha='center', rotation=90))
+            else:
+                row_texts.append(fig.text(pos.x0-0.375*pos.width, pos.y0+0.5*pos.height, '',
+                    va='center'))
+
+    for title, text in zip(row_titles, row_texts):
         if biphasic:
-            ax.text2D(-0.1, 0.5, title.replace('\n', ' '), transform=ax.transAxes, va='center', ha='center', rotation=90)
-        else:
-            ax.text2D(-0.375, 0.5, title, transform=ax.transAxes, va='center')
+            title = title.replace('\n', ' ')
+        text.set_text(title)
 
-    for ax in axes:
-        ax.set_axis_off()
-    
     naxes = cols -1
-
-    for i in range(3):
-        viewargs = copy.deepcopy(kwargs)
-        viewargs['elev'] = views[i][0]
-        viewargs['azim'] = views[i][1]
-        
-        if i == 0:
-            compare_3d_vectormaps(axes=axes[i*naxes:(i+1)*naxes]+[axes[0].illustrate_ax, axes[0].error_ax],
-                    biphasic=biphasic,
-                    kwargsD={'colorbar': True, 'colorbar_ax': axes[0].colorbar_ax},
-                    illustrate=True, total_error=True,
-                    *args, **viewargs)
-        else:
-            compare_3d_vectormaps(axes=axes[i*naxes:(i+1)*naxes]+[axes[0].illustrate_ax, axes[0].error_ax],
-                    biphasic=biphasic, illustrate=False, total_error=False,
-                    kwargsD={'colorbar': False},
-                    *args, **viewargs)
     
+    # The views differ only by the camera; compute the vectors and
+    # errors in the first view and reuse them in the others
+    cached_result = {}
+    
+    # Each view's own axes, one row each
+    view_slices = [axes[i*naxes:(i+1)*naxes] for i in range(len(views))]
+
+    def draw_view(view_axes, view, **options):
+        compare_3d_vectormaps(axes=view_axes, biphasic=biphasic,
+                _cached_result=cached_result, *args,
+                **options, **{**kwargs, 'elev': view[0], 'azim': view[1]})
+
+    # Only the first view draws the colorbar, illustration and total
+    # error, so only it needs the aux axes after its own axes
+    draw_view(view_slices[0] + _setup_aux_axes(illustrate_ax, error_ax, column_titles[-1]),
+            views[0], kwargsD={'colorbar': True, 'colorbar_ax': colorbar_ax},
+            illustrate=illustrate_ax is not None, total_error=error_ax is not None)
+    
+    for view_axes, view in zip(view_slices[1:], views[1:]):
+        draw_view(view_axes, view, kwargsD={'colorbar': False},
+                illustrate=False, total_error=False)
+    
+    # In one pass after plotting; view_init may reset dist
     for ax in axes:
+        ax.set_axis_off()
         ax.dist = 6
 
-    axes[0].illustrate_ax.set_position(axes[0].illustrate_ax.cbox)
     return [axes]
@@ -5,6 +5,7 @@ Common helper functions likely needed in many different plots.
 import os
 import math
 import copy
+import functools
 import multiprocessing
 
 import numpy as np
@@ -12,6 +13,7 @@ from scipy.spatial import cKDTree as KDTree
 import matplotlib.pyplot as plt
 import matplotlib.animation
 import matplotlib.colors
+from matplotlib.backend_bases import FigureCanvasBase
 from matplotlib.patches import FancyArrowPatch, CirclePolygon
 from mpl_toolkits.mplot3d import proj3d, art3d
 from matplotlib import cm
@@ -26,10 +28,10 @@ VECTORMAP_PULSATION_PARAMETERS = {'step_size': 0.02, 'low_val': 0.33, 'high_val'
 
 
 # Taken from drosoeyes.blend
-RHABDOMERE_LOCATIONS = [(-1.6881, 1.0273), (-1.8046, -0.9934),
+RHABDOMERE_LOCATIONS = ((-1.6881, 1.0273), (-1.8046, -0.9934),
         (-1.7111, -2.9717), (-0.0025, -1.9261), (1.6690, -0.9493),
-        (1.6567, 0.9762), (0.0045, -0.0113)]
-RHABDOMERE_DIAMETERS = [1.8627,1.8627,1.8627,1.8627,1.8627,1.8627, 1.5743]
+        (1.6567, 0.9762), (0.0045, -0.0113))
+RHABDOMERE_DIAMETERS = (1.8627,1.8627,1.8627,1.8627,1.8627,1.8627, 1.5743)
 RHABDOMERE_R3R6_ROTATION = math.radians(-49.7)
 
 
@@ -246,6 +248,24 @@ def plot_2d_opticflow(ax, direction):
         ax.scatter(x,y, marker='x', color='darkviolet')
 
 
+@functools.lru_cache(maxsize=128)
+def camera_vector(elev, azim):
+    '''
+    Returns the unit vector pointing to an observer at (elev,azim).
+    Cached since the same camera position is used for every arrow;
+    the returned array is read-only.
+
+    NOTICE: Elev from horizontal plane (a non-ISO convention) and azim as in ISO
+    '''
+    cx = math.sin(math.radians(90-elev)) * math.cos(math.radians(azim))
+    cy = math.sin(math.radians(90-elev)) * math.sin(math.radians(azim))
+    cz = math.cos(math.radians(90-elev))
+
+    vector = np.array((cx,cy,cz))
+    vector.flags.writeable = False
+    return vector
+
+
 def is_behind_sphere(elev, azim, point):
     '''
     Calculates wheter a point seend by observer at (elev,azim) in spehrical
@@ -253,19 +273,9 @@ def is_behind_sphere(elev, azim, point):
     
     NOTICE: Elev from horizontal plane (a non-ISO convention) and azim as in ISO
     '''
-
-    cx = np.sin(np.radians(90-elev)) * np.cos(np.radians(azim))
-    cy = np.sin(np.radians(90-elev)) * np.sin(np.radians(azim))
-    cz = np.cos(np.radians(90-elev))
-    
-    vec_cam = (cx,cy,cz)
-    vec_arr = point
-    
-    angle = np.arccos(np.inner(vec_cam, vec_arr)/(np.linalg.norm(vec_cam)*np.linalg.norm(vec_arr)))
-    if angle > np.pi/2:
-        return True
-    else:
-        return False
+    # The angle between the camera and the point is over 90 degrees
+    # exactly when their inner product is negative
+    return bool(np.inner(camera_vector(elev, azim), point) < 0)
 
 
 
@@ -419,6 +429,9 @@ def surface_plot(ax, points, values, cb=False, phi_points=None, theta_points=Non
 
     points
     values
+    phi_points : array, list of arrays or None
+        Azimuthal angles of the surface. A list of consecutive ranges
+        (may wrap around 2 pi) is joined into one surface.
     '''
 
     if len(points) != len(values):
@@ -430,6 +443,8 @@ def surface_plot(ax, points, values, cb=False, phi_points=None, theta_points=Non
     N = 100
     if phi_points is None:
         phi_points = np.linspace(0, 2*np.pi, N)
+    elif isinstance(phi_points, (list, tuple)) and np.ndim(phi_points[0]) == 1:
+        phi_points = np.concatenate(phi_points)
     
     phi, theta = np.meshgrid(phi_points, np.linspace(0, np.pi, N))
     X = np.sin(theta) * np.cos(phi)
@@ -471,7 +486,7 @@ def surface_plot(ax, points, values, cb=False, phi_points=None, theta_points=Non
         errs = np.empty_like(x)
         positions = [[x.flat[i], y.flat[i], z.flat[i]] for i in range(x.size)]
 
-        distances, i_points = kdtree.query( positions, n_jobs=-1 )
+        distances, i_points = kdtree.query( positions, workers=-1 )
         
         for i in range(errs.size):
             if distances[i] < intp_dist:
@@ -680,7 +695,12 @@ def save_3d_animation(manalyser, ax=None, plot_function=None,interframe_callback
             for ax in axes:
                 ax.view_init(elev=animation_variable[0], azim=animation_variable[1])
         
-        axes[0].figure.canvas.draw_idle()
+        # The frame gets rendered by savefig/grab_frame below. On non-interactive
+        # canvases draw_idle is not deferred but renders the whole figure once more,
+        # so only request it when there is a live canvas to update
+        canvas = axes[0].figure.canvas
+        if type(canvas).draw_idle is not FigureCanvasBase.draw_idle:
+            canvas.draw_idle()
         interframe_callback()
 
         if video_writer:
@@ -629,7 +629,7 @@ def _load_ergs():
 
     for line in csvfile:
         efn = line[1]
-        match = glob.glob(ergs_rootdir+'/**/'+efn)
+        match = glob.glob(os.path.join(ergs_rootdir, '**', efn))
         if len(match) != 1:
             print('{} not found'.format(efn))
             #ergs.append(None)
@@ -2,7 +2,6 @@
 import os
 import subprocess
 import sys
-import platform
 
 from gonioanalysis.droso import SpecimenGroups
 from gonioanalysis.directories import CODE_ROOTDIR
@@ -173,7 +172,7 @@ class Core:
 
        
         # 2) Find the full path to the adm Python file in the gonio root
-        pyfile = os.path.join(CODE_ROOTDIR, 'drosom/terminal.py')
+        pyfile = os.path.join(CODE_ROOTDIR, 'drosom', 'terminal.py')
         
         # Check for spaces in the filename. If there are spaces in the filename,
         # we have to encapsulate the filename by quation marks
@@ -195,9 +194,9 @@ class Core:
         command = '{} {} {} &'.format(python, pyfile, arguments)
         
         if open_terminal:
-            if platform.system() == 'Linux':
+            if sys.platform.startswith('linux'):
                 command = 'lxterm -e ' + command
-            elif platform.system() == 'Windows':
+            elif sys.platform == 'win32':
                 command = 'start /wait ' + command
             else:
                 raise OSError('Operating system not supported by gonio?')
@@ -8,7 +8,7 @@ exec(open("gonioanalysis/version.py").read())
 
 install_requires = [
         'numpy',
-        'scipy',
+        'scipy>=1.6',
         'tifffile',
         'matplotlib',
         'tk-steroids>=0.6.0',
@@ -34,5 +34,5 @@ setuptools.setup(
         "License :: OSI Approved :: GNU General Public License v3 (GPLv3) ",
         "Operating System :: OS Independent",
     ],
-    python_requires='>=3.0',
+    python_requires='>=3.7',
 )
@@ -0,0 +1,99 @@
+import unittest
+
+import numpy as np
+from scipy.spatial import cKDTree as KDTree
+
+from gonioanalysis.drosom.optic_flow import field_error
+
+
+def reference_field_error(points_A, vectors_A, points_B, vectors_B, direction=False, colinear=False):
+    '''
+    The original per-vector loop implementation of field_error
+    '''
+    errors = np.empty(len(vectors_A))
+
+    kdtree = KDTree(points_B)
+    distances, indices = kdtree.query(points_A, k=10)
+    weights = 1/(np.array(distances)**2)
+
+    for i_weights in range(weights.shape[0]):
+        if any(np.isinf(weights[i_weights])):
+            weights[i_weights] = np.isinf(weights[i_weights]).astype('int')
+
+    compare_vectors = [[vectors_B[i] for i in indx] for indx in indices]
+
+    for i, (vecA, vecBs, vecB_weights) in enumerate(zip(vectors_A, compare_vectors, weights)):
+        vec_errors = []
+        for vecB in vecBs:
+            angle = np.arccos(np.inner(vecA, vecB)/(np.linalg.norm(vecA) * np.linalg.norm(vecB)))
+            error = angle / np.pi
+            if not 0<=error<=1:
+                if np.array_equal(vecA, vecB):
+                    error = 0
+                else:
+                    error = 1
+            if direction and vecB[2] > vecA[2]:
+                error = -error
+            vec_errors.append(error)
+        errors[i] = np.average(vec_errors, weights=vecB_weights)
+
+    if colinear:
+        errors = 2 * np.abs(errors - 0.5)
+    else:
+        errors = 1 - errors
+
+    return errors
+
+
+class TestFieldError(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+
+        self.points_B = rng.normal(size=(60, 3))
+        self.vectors_B = rng.normal(size=(60, 3))
+
+        # Zero vectors on both sides, one pair of them at the same point
+        self.vectors_B[:5] = 0
+
+        self.points_A = rng.normal(size=(40, 3))
+        self.vectors_A = rng.normal(size=(40, 3))
+        self.vectors_A[:3] = 0
+
+        # Points overlapping with points_B give infinite weights
+        self.points_A[:3] = self.points_B[:3]
+        self.points_A[10:15] = self.points_B[10:15]
+        self.vectors_A[10:12] = self.vectors_B[10:12]
+
+    def assert_matches_reference(self, **kwargs):
+        args = (self.points_A, self.vectors_A, self.points_B, self.vectors_B)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            expected = reference_field_error(*args, **kwargs)
+        errors = field_error(*args, **kwargs)
+
+        self.assertEqual(errors.shape, expected.shape)
+        self.assertFalse(np.any(np.isnan(errors)))
+        np.testing.assert_allclose(errors, expected, atol=1e-5)
+
+    def test_default(self):
+        '''
+        Plain errors, including zero vectors and overlapping points
+        '''
+        self.assert_matches_reference()
+
+    def test_direction(self):
+        '''
+        Signed errors
+        '''
+        self.assert_matches_reference(direction=True)
+
+    def test_colinear(self):
+        '''
+        Colinear errors, with and without direction
+        '''
+        self.assert_matches_reference(colinear=True)
+        self.assert_matches_reference(direction=True, colinear=True)
+
+
+if __name__ == '__main__':
+    unittest.main()